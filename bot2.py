@@ -4,7 +4,15 @@ from discord.ext import commands
 import asyncio
 from dotenv import load_dotenv
 import aiohttp
-load_dotenv('token.env')
+try:
+    import uvloop  # not available on Windows
+except ImportError:
+    uvloop = None
+# Load every env file once at startup; cogs only read os.environ
+for env_file in ('token.env', 'google.env'):
+    load_dotenv(env_file)
+
+loading = ['cogs.ai', 'cogs.moderation', 'cogs.automod', 'cogs.blacklist', 'cogs.welcome', 'cogs.fun']
 
 class Bot(commands.Bot):
     # Suppress error on the User attribute being None since it fills up later
@@ -16,14 +24,37 @@ class Bot(commands.Bot):
         intents.members = True 
         intents.guilds = True # Needed for member join events
         super().__init__(command_prefix='-', intents=intents)
+        self.session: aiohttp.ClientSession | None = None
 
     async def setup_hook(self) -> None:
-        # Create a session for making HTTP requests.
-        self.session = aiohttp.ClientSession()
+        # Create one shared session for making HTTP requests; cogs reuse its
+        # connection pool via bot.session instead of opening their own.
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=75)
+        )
+        await self.load_extensions()
+        # setup_hook runs once per login, not on every (re)connect, so this syncs once per process.
+        try:
+            synced = await self.tree.sync()
+            print(f'Synced {len(synced)} application command(s)')
+        except discord.HTTPException as e:
+            print(f'Failed to sync application commands: {e}')
+
+    async def load_extensions(self) -> None:
+        # Load all cogs concurrently instead of one after another.
+        results = await asyncio.gather(
+            *(self.load_extension(name) for name in loading), return_exceptions=True
+        )
+        for name, result in zip(loading, results):
+            if isinstance(result, BaseException):
+                print(f'Failed to load extension {name}: {result}')
+            else:
+                print(f'Loaded extension: {name}')
 
     async def close(self) -> None:
-        # Close the session when the bot is shutting down.
-        await self.session.close()
+        # Close the session when the bot is shutting down (setup_hook may not have run).
+        if self.session is not None:
+            await self.session.close()
         await super().close()
 
     async def on_ready(self):
@@ -39,20 +70,20 @@ async def debug(ctx):
     await ctx.send(f"Help commands found: {len(help_commands)}")
 
 
-loading = ['cogs.ai', 'cogs.moderation', 'cogs.automod', 'cogs.blacklist', 'cogs.welcome', 'cogs.fun']
-
-async def load_extensions():
-    for i in loading:
-        try:
-            await bot.load_extension(i)
-            print(f'Loaded extension: {i}')
-        except Exception as e:
-            print(f'Failed to load extension {i}: {e}')
+async def main():
+    token = os.getenv("token")
+    if not token:
+        print("ERROR: Bot token is empty or not found in environment variables")
+        return
+    # Optional keep-alive web server for hosts like Replit
+    if os.getenv("keep_alive", "").lower() in ("1", "true", "yes"):
+        from keep_Alive import keep_alive
+        keep_alive()
+    async with bot:
+        await bot.start(token)
 
 if __name__ == "__main__":
-    asyncio.run(load_extensions())
-
-token = str(os.getenv("token"))
-
-bot.run(token)
-
+    if uvloop is not None:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
@@ -2,18 +2,52 @@ import os
 import re
 import asyncio
 import discord
-import time
+import functools
 import random
+import time
 from discord import app_commands
 from discord.ext import commands
-from google import genai
-from google.genai import types
-from typing import Optional, Dict, List, Union
-from functools import lru_cache
+from typing import Union
 import logging
-from dotenv import load_dotenv
 
-load_dotenv('google.env')
+# Discord markup in a single alternation: user, role, channel, custom emoji,
+# then any other <...> markup. The matched group index selects the replacement.
+_DISCORD_MARKUP_RE = re.compile(r'<(?:(@!?\d+)|(@&\d+)|(#\d+)|(a?:\w+:\d+)|[^>]+)>')
+_MARKUP_REPLACEMENTS = {1: '@user', 2: '@role', 3: '#channel', 4: ':emoji:'}
+
+
+def _replace_markup(match: re.Match) -> str:
+    return _MARKUP_REPLACEMENTS.get(match.lastindex, '')  # type: ignore
+
+
+# Fixed framing around every /ask question
+PROMPT_PREFIX = "User question: "
+PROMPT_SUFFIX = "\n\nPlease provide a helpful, accurate response."
+
+JOKE_PROMPTS = (
+    "Tell me a clean, funny joke that would be appropriate for a Discord server.",
+    "Share a clever pun or wordplay joke.",
+    "Give me a light-hearted, family-friendly joke.",
+    "Tell me a programming or tech-related joke.",
+    "Share a dad joke that will make people groan and laugh."
+)
+
+AI_HELP_TEXT = """
+        **Available AI Commands:**
+        
+        `/ask <question>` or `!ask <question>` - Ask me anything! I'll do my best to help.
+        `/joke` or `!joke` - Get a random joke to brighten your day.
+        `/ai_commands` or `!ai_commands` - Show this help message.
+        
+        **Tips:**
+        • Be specific with your questions for better answers
+        • There's a 3-second cooldown between requests
+        • Keep questions under 2000 characters
+        • I'm powered by Google's Gemini AI
+        • Commands work both as slash commands (/) and prefix commands (!)
+        
+        **Note:** Please be respectful and follow server rules!
+        """
 
 
 class AICog(commands.Cog):
@@ -26,29 +60,34 @@ class AICog(commands.Cog):
         self.MAX_RESPONSE_LENGTH = 1500
         self.REQUEST_TIMEOUT = 30
         
-        # Rate limiting (per user)
-        self.user_cooldowns: Dict[int, float] = {}
+        # Rate limiting (per user): monotonic expiry per id. The cooldown is constant, so insertion
+        # order is expiry order and expired ids are purged from the front without timers
+        self._cooling: dict[int, float] = {}
         self.COOLDOWN_SECONDS = 3
         
-        # Initialize Google AI client
+        # Initialize Google AI client and generation config
+        self.text_generation_config = None
         self._initialize_client()
         
-        # Optimized generation config - simplified for compatibility
-        self.text_generation_config = types.GenerateContentConfig(
-            temperature=0.7,
-            top_p=0.9,
-            top_k=40,
-            max_output_tokens=500
+        # Static help embed, built once and reused by ai_commands
+        self._help_embed = discord.Embed(
+            title="🤖 AI Commands Help",
+            description=AI_HELP_TEXT,
+            color=discord.Color.green()
         )
 
     def _initialize_client(self):
         """Initialize Google AI client with proper error handling"""
         try:
-            api_key = str(os.getenv("key"))  # read 'key' from environment variables
+            api_key = os.getenv("key")  # read 'key' from environment variables
             
-            if not api_key or api_key == "None":
+            if not api_key:
                 raise ValueError("API key is empty or not found in environment variables")
             
+            # Deferred so the heavy Google SDK is only imported when a key is configured
+            from google import genai
+            from google.genai import types
+            
             # Initialize client with proper error checking
             self.client = genai.Client(api_key=api_key)
             
@@ -56,6 +95,14 @@ class AICog(commands.Cog):
             if not hasattr(self.client, 'models'):
                 raise AttributeError("Client initialization failed - models attribute missing")
             
+            # Optimized generation config - simplified for compatibility
+            self.text_generation_config = types.GenerateContentConfig(
+                temperature=0.7,
+                top_p=0.9,
+                top_k=40,
+                max_output_tokens=400  # ~MAX_RESPONSE_LENGTH chars at ~4 chars/token
+            )
+            
             print("Google AI client initialized successfully")
             
         except ValueError as e:
@@ -66,24 +113,17 @@ class AICog(commands.Cog):
             self.client = None
 
     @staticmethod
-    @lru_cache(maxsize=100)
     def clean_discord_message(message: str) -> str:
-        """Clean Discord message formatting with caching"""
+        """Clean Discord message formatting"""
         if not message:
             return ""
         
-        # Remove Discord formatting
-        patterns = [
-            (re.compile(r'<@!?\d+>'), '@user'),      # User mentions
-            (re.compile(r'<@&\d+>'), '@role'),       # Role mentions  
-            (re.compile(r'<#\d+>'), '#channel'),     # Channel mentions
-            (re.compile(r'<a?:\w+:\d+>'), ':emoji:'), # Custom emojis
-            (re.compile(r'<[^>]+>'), ''),             # Other Discord markup
-        ]
-        
-        cleaned = message
-        for pattern, replacement in patterns:
-            cleaned = pattern.sub(replacement, cleaned)
+        # Most messages carry no markup at all, so skip the regex entirely
+        if '<' in message:
+            # Remove Discord formatting in one pass
+            cleaned = _DISCORD_MARKUP_RE.sub(_replace_markup, message)
+        else:
+            cleaned = message
         
         # Trim whitespace and limit length
         cleaned = cleaned.strip()
@@ -91,124 +131,102 @@ class AICog(commands.Cog):
 
     def _check_rate_limit(self, user_id: int) -> bool:
         """Check if user is rate limited"""
-        now = time.time()
-        
-        if user_id in self.user_cooldowns:
-            if now - self.user_cooldowns[user_id] < self.COOLDOWN_SECONDS:
-                return False
+        now = time.monotonic()
+        self._purge_cooldowns(now)
+        if user_id in self._cooling:
+            return False
         
-        self.user_cooldowns[user_id] = now
+        self._cooling[user_id] = now + self.COOLDOWN_SECONDS
         return True
 
+    def _purge_cooldowns(self, now: float):
+        cooling = self._cooling
+        while cooling:
+            user_id = next(iter(cooling))
+            if cooling[user_id] > now:
+                break
+            del cooling[user_id]
+
     async def _generate_response_with_timeout(self, prompt: str) -> str:
         """Generate AI response with timeout and error handling"""
         if not self.client:
             return "❌ AI service is not available. Please contact an administrator."
         
         try:
-            # Use asyncio.wait_for for timeout protection
+            # Native async client call, protected by asyncio.wait_for timeout
             response = await asyncio.wait_for(
-                self._generate_response_async(prompt),
+                self.client.aio.models.generate_content(
+                    model="gemini-2.0-flash-exp",
+                    contents=[prompt],
+                    config=self.text_generation_config
+                ),
                 timeout=self.REQUEST_TIMEOUT
             )
-            return response
-            
-        except asyncio.TimeoutError:
-            return "⏰ Request timed out. Please try again with a shorter question."
-        except Exception as e:
-            logging.error(f"AI generation error: {e}")
-            return f"❌ Sorry, I encountered an error: {str(e)[:100]}..."
-
-    async def _generate_response_async(self, prompt: str) -> str:
-        """Async wrapper for AI generation"""
-        try:
-            # Run the synchronous API call in an executor
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None, 
-                self._generate_sync, 
-                prompt
-            )
-            return response
-            
-        except Exception as e:
-            raise e
-
-    def _generate_sync(self, prompt: str) -> str:
-        """Synchronous AI generation"""
-        try:
-            if not self.client:
-                raise Exception("AI client is not initialized")
-            
-            # Updated API call for newer Google Gemini client
-            response = self.client.models.generate_content(
-                model="gemini-2.0-flash-exp",
-                contents=[prompt],
-                config=self.text_generation_config
-            )
             
             if not response or not response.text:
                 return "🤔 I couldn't generate a response. Please try rephrasing your question."
             
-            # Limit response length for Discord
+            # Limit response length for Discord (safety net; the token cap should stop generation first)
             text = response.text.strip()
             if len(text) > self.MAX_RESPONSE_LENGTH:
                 text = text[:self.MAX_RESPONSE_LENGTH] + "..."
             
             return text
             
+        except asyncio.TimeoutError:
+            return "⏰ Request timed out. Please try again with a shorter question."
         except Exception as e:
-            raise e
+            logging.error(f"AI generation error: {e}")
+            return f"❌ Sorry, I encountered an error: {str(e)[:100]}..."
 
     def _create_embed(self, title: str, description: str, color: discord.Color) -> discord.Embed:
         """Create standardized embed with footer"""
-        embed = discord.Embed(
-            title=title,
-            description=description,
-            color=color
-        )
-        embed.set_footer(text="Powered by Google AI")
-        return embed
+        # from_dict fills every field in one pass instead of constructor + set_footer
+        return discord.Embed.from_dict({
+            "title": title,
+            "description": description,
+            "color": color.value,
+            "footer": {"text": "Powered by Google AI"},
+        })
 
     async def _safe_response_hybrid(self, ctx_or_interaction: Union[commands.Context, discord.Interaction], embed: discord.Embed):
         """Safe response handling for both contexts and interactions"""
+        # Resolve the sender once: context send, interaction followup, or initial response
+        if isinstance(ctx_or_interaction, commands.Context):
+            send = ctx_or_interaction.send
+        elif ctx_or_interaction.response.is_done():
+            send = ctx_or_interaction.followup.send
+        else:
+            send = ctx_or_interaction.response.send_message
+        
         try:
-            if isinstance(ctx_or_interaction, commands.Context):
-                # Context (prefix command)
-                await ctx_or_interaction.send(embed=embed)
-            else:
-                # Interaction (slash command)
-                if ctx_or_interaction.response.is_done():
-                    await ctx_or_interaction.followup.send(embed=embed)
-                else:
-                    await ctx_or_interaction.response.send_message(embed=embed)
+            await send(embed=embed)
         except discord.HTTPException:
             # Fallback to plain text if embed fails
             try:
-                content = f"**{embed.title}**\n{embed.description}"
-                if isinstance(ctx_or_interaction, commands.Context):
-                    await ctx_or_interaction.send(content[:2000])
-                else:
-                    if ctx_or_interaction.response.is_done():
-                        await ctx_or_interaction.followup.send(content[:2000])
-                    else:
-                        await ctx_or_interaction.response.send_message(content[:2000])
+                await send(f"**{embed.title}**\n{embed.description}"[:2000])
             except Exception:
                 pass
 
     async def _send_ephemeral_or_reply(self, ctx_or_interaction: Union[commands.Context, discord.Interaction], embed: discord.Embed):
         """Send ephemeral for slash commands or regular reply for prefix commands"""
+        if isinstance(ctx_or_interaction, commands.Context):
+            send = ctx_or_interaction.send
+        else:
+            send = functools.partial(ctx_or_interaction.response.send_message, ephemeral=True)
+        
         try:
-            if isinstance(ctx_or_interaction, commands.Context):
-                await ctx_or_interaction.send(embed=embed)
-            else:
-                await ctx_or_interaction.response.send_message(embed=embed, ephemeral=True)
+            await send(embed=embed)
         except discord.HTTPException:
-            content = f"**{embed.title}**\n{embed.description}"
-            if isinstance(ctx_or_interaction, commands.Context):
-                await ctx_or_interaction.send(content[:2000])
-            else:
-                await ctx_or_interaction.response.send_message(content[:2000], ephemeral=True)
+            await send(f"**{embed.title}**\n{embed.description}"[:2000])
+
+    async def _respond_with_ai(self, ctx: commands.Context, prompt: str, title: str, color: discord.Color):
+        """Generate a response for the prompt and send it as an embed"""
+        # Hybrid commands always get a Context; for slash invocations typing() defers the interaction
+        async with ctx.typing():
+            response_text = await self._generate_response_with_timeout(prompt)
+            embed = self._create_embed(title, response_text, color)
+            await self._safe_response_hybrid(ctx, embed)
 
     @commands.hybrid_command(name="ask", description="Ask a question to the AI")
     @app_commands.describe(question="Your question for the AI")
@@ -232,46 +250,13 @@ class AICog(commands.Cog):
             )
             return await self._send_ephemeral_or_reply(ctx, embed)
         
-        # Handle defer differently for context vs interaction
-        if isinstance(ctx, commands.Context):
-            async with ctx.typing():
-                # Clean and process the question
-                cleaned_question = self.clean_discord_message(question)
-                
-                # Add context for better responses
-                enhanced_prompt = f"User question: {cleaned_question}\n\nPlease provide a helpful, accurate response."
-                
-                # Generate response
-                response_text = await self._generate_response_with_timeout(enhanced_prompt)
-                
-                # Create and send embed
-                embed = self._create_embed(
-                    "🤖 AI Response",
-                    response_text,
-                    discord.Color.blue()
-                )
-                
-                await self._safe_response_hybrid(ctx, embed)
-        else:
-            await ctx.defer()
-            
-            # Clean and process the question
-            cleaned_question = self.clean_discord_message(question)
-            
-            # Add context for better responses
-            enhanced_prompt = f"User question: {cleaned_question}\n\nPlease provide a helpful, accurate response."
-            
-            # Generate response
-            response_text = await self._generate_response_with_timeout(enhanced_prompt)
-            
-            # Create and send embed
-            embed = self._create_embed(
-                "🤖 AI Response",
-                response_text,
-                discord.Color.blue()
-            )
-            
-            await self._safe_response_hybrid(ctx, embed)
+        # Clean and process the question
+        cleaned_question = self.clean_discord_message(question)
+        
+        # Add context for better responses
+        enhanced_prompt = PROMPT_PREFIX + cleaned_question + PROMPT_SUFFIX
+        
+        await self._respond_with_ai(ctx, enhanced_prompt, "🤖 AI Response", discord.Color.blue())
 
     @commands.hybrid_command(name="joke", description="Get a random joke from the AI")
     async def joke_command(self, ctx: commands.Context):
@@ -285,76 +270,22 @@ class AICog(commands.Cog):
             )
             return await self._send_ephemeral_or_reply(ctx, embed)
         
-        joke_prompts = [
-            "Tell me a clean, funny joke that would be appropriate for a Discord server.",
-            "Share a clever pun or wordplay joke.",
-            "Give me a light-hearted, family-friendly joke.",
-            "Tell me a programming or tech-related joke.",
-            "Share a dad joke that will make people groan and laugh."
-        ]
-        
-        selected_prompt = random.choice(joke_prompts)
+        selected_prompt = random.choice(JOKE_PROMPTS)
         
-        # Handle defer differently for context vs interaction
-        if isinstance(ctx, commands.Context):
-            async with ctx.typing():
-                response_text = await self._generate_response_with_timeout(selected_prompt)
-                
-                embed = self._create_embed(
-                    "😄 Here's a joke for you!",
-                    response_text,
-                    discord.Color.purple()
-                )
-                
-                await self._safe_response_hybrid(ctx, embed)
-        else:
-            await ctx.defer()
-            
-            response_text = await self._generate_response_with_timeout(selected_prompt)
-            
-            embed = self._create_embed(
-                "😄 Here's a joke for you!",
-                response_text,
-                discord.Color.purple()
-            )
-            
-            await self._safe_response_hybrid(ctx, embed)
+        await self._respond_with_ai(ctx, selected_prompt, "😄 Here's a joke for you!", discord.Color.purple())
 
     @commands.hybrid_command(name="ai_commands", description="Get help with AI commands")
     async def ai_commands(self, ctx: commands.Context):
         """Show AI help information"""
-        help_text = """
-        **Available AI Commands:**
-        
-        `/ask <question>` or `!ask <question>` - Ask me anything! I'll do my best to help.
-        `/joke` or `!joke` - Get a random joke to brighten your day.
-        `/ai_commands` or `!ai_commands` - Show this help message.
-        
-        **Tips:**
-        • Be specific with your questions for better answers
-        • There's a 3-second cooldown between requests
-        • Keep questions under 2000 characters
-        • I'm powered by Google's Gemini AI
-        • Commands work both as slash commands (/) and prefix commands (!)
-        
-        **Note:** Please be respectful and follow server rules!
-        """
-        
-        embed = discord.Embed(
-            title="🤖 AI Commands Help",
-            description=help_text,
-            color=discord.Color.green()
-        )
-        
-        await self._send_ephemeral_or_reply(ctx, embed)
+        await self._send_ephemeral_or_reply(ctx, self._help_embed)
 
     @commands.hybrid_command(name='ai_status', description="Check AI service status")
     @commands.has_permissions(administrator=True)
     async def ai_status(self, ctx: commands.Context):
         """Check AI service status (Admin only)"""
         status = "🟢 Online" if self.client else "🔴 Offline"
-        cooldown_count = len([t for t in self.user_cooldowns.values() 
-                             if (time.time() - t) < self.COOLDOWN_SECONDS])
+        self._purge_cooldowns(time.monotonic())
+        cooldown_count = len(self._cooling)
         
         embed = discord.Embed(
             title="🔧 AI Service Status",
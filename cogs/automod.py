@@ -1,160 +1,499 @@
+import asyncio
 import sqlite3
 import discord
 from discord.ext import commands
-from typing import Optional, Set, Dict
+from typing import AbstractSet, FrozenSet, Optional, Set, Dict, Tuple
 import re
-from functools import lru_cache
-import ast
+from cachetools import LRUCache, TTLCache
 import os
+import sys
+import threading
+
+from cogs.blacklist import load_blacklist_from_file, parse_blacklist_source
+
+try:
+    import hyperscan  # optional SIMD multi-pattern matcher
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick_rs  # optional Rust Aho-Corasick binding
+except ImportError:
+    ahocorasick_rs = None
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _has_word_boundaries(text: str, start: int, end: int) -> bool:
+    """True if text[start:end] is not glued to word characters on either side"""
+    if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+        return False
+    if end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]):
+        return False
+    return True
+
+
+def _bounded_pattern(word: str) -> str:
+    """Regex for a blacklist word with \\b only on edges that are word characters"""
+    start = r"\b" if _is_word_char(word[0]) else ""
+    end = r"\b" if _is_word_char(word[-1]) else ""
+    return start + re.escape(word) + end
+
+
+# Sentinel key marking the end of a word in the trie (characters are 1-length keys)
+_TRIE_END = "_end"
+
+
+def _stop_on_match(pattern_id: int, start: int, end: int, flags: int, context) -> bool:
+    """Hyperscan match handler: returning True terminates the scan on the first hit"""
+    return True
+
 
 class AutoMod(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
 
         # Initialize blacklist
-        self._blacklist: Set[str] = set()
-        self._pattern: Optional[re.Pattern] = None
+        self.words_file = "cogs/words.py"
+        self._blacklist_version: Optional[tuple] = None
+        self.SMALL_BLACKLIST_SIZE = 8
+        self._blacklist: AbstractSet[str] = set()
+        self._pending_blacklist: Optional[FrozenSet[str]] = None  # newest snapshot from BlacklistCog
+        self._blacklist_generation = 0  # bumped per blacklist_update; stale reloads are discarded
+        self._trie: dict = {}
+        self._hs_db = None
+        self._hs_scratch = None
+        self._ac = None
+        self._small_words: tuple = ()
+        self._blacklist_words: tuple = ()
+        self._first_chars: frozenset = frozenset()
+        self._min_word_len = 0
+        self._scan_cache: LRUCache = LRUCache(maxsize=2048)
         self._load_blacklist()
         self._compile_blacklist_patterns()
 
+        # Staff status per (user_id, guild_id); the TTL bounds staleness from role/permission edits
+        self._staff_cache: TTLCache = TTLCache(maxsize=4096, ttl=300)
+
         # Database & warnings
         self.db_file = "warnings.db"
+        self._conn: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
         self.MAX_WARNINGS = 10
         self._init_database()
-        self.fallback_warnings: Dict[int, int] = {}
+        # Bounded: an evicted user is simply re-read from the database (or a pending write) on next sight
+        self.warning_counts: LRUCache = LRUCache(maxsize=50_000)
+
+        # Warning writes are queued and flushed in batches off the event loop
+        self.FLUSH_INTERVAL = 0.1
+        self.RETRY_DELAY = 5.0  # back-off before retrying a failed batch
+        self._pending_writes: Dict[int, int] = {}
+        self._writing: Dict[int, int] = {}  # batch handed to the worker thread, not yet committed
+        self._pending_event = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
 
     # ---------------- Blacklist loading ----------------
     def _load_blacklist(self):
         """Load blacklist from cogs/words.py (variable: blat)"""
-        words_file = "cogs/words.py"
-        if not os.path.exists(words_file):
+        self._blacklist, self._blacklist_version = self._read_blacklist()
+
+    def _read_blacklist(self) -> Tuple[Set[str], Optional[tuple]]:
+        """Read words.py without touching cog state; returns (words, version stamp)"""
+        words_file = self.words_file
+        version = self._words_file_version()
+        if version is None:
             print("[AutoMod] Warning: words.py not found, blacklist empty.")
-            self._blacklist = set()
-            return
+            return set(), None
 
+        # Shared loader: JSON sidecar fast path, fresh source parse when words.py changed
         try:
-            with open(words_file, "r", encoding="utf-8") as f:
-                content = f.read()
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Assign):
-                    for target in node.targets:
-                        if isinstance(target, ast.Name) and target.id == "blat":
-                            if isinstance(node.value, ast.List):
-                                self._blacklist = set(
-                                    ast.literal_eval(elem) 
-                                    for elem in node.value.elts
-                                    if isinstance(elem, ast.Constant) and isinstance(elem.value, str)
-                                )
-            print(f"[AutoMod] Loaded {len(self._blacklist)} blacklist words.")
+            blacklist = set(load_blacklist_from_file(words_file))
         except Exception as e:
-            print(f"[AutoMod] Error loading blacklist: {e}")
-            self._blacklist = set()
+            print(f"[AutoMod] Could not load words.py ({e}), parsing source instead.")
+            blacklist = set(parse_blacklist_source(words_file))
+        print(f"[AutoMod] Loaded {len(blacklist)} blacklist words.")
+        return blacklist, version
 
-    def _compile_blacklist_patterns(self):
-        """Compile regex pattern for fast blacklist detection"""
-        if not self._blacklist:
-            self._pattern = None
-            return
+    def _words_file_version(self) -> Optional[tuple]:
+        """Cheap change stamp for words.py: (mtime_ns, size), or None if the file is missing"""
         try:
-            escaped = [re.escape(word) for word in self._blacklist]
-            pattern = r"\b(?:{})(?:\b|$)".format("|".join(escaped))
-            self._pattern = re.compile(pattern, re.IGNORECASE)
-        except re.error as e:
-            print(f"[AutoMod] Regex compile error: {e}")
-            self._pattern = None
-
-    def reload_blacklist(self) -> Set[str]:
+            st = os.stat(self.words_file)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _compile_blacklist_patterns(self):
+        """Compile Hyperscan, Aho-Corasick or trie matcher (best available) for fast blacklist detection"""
+        self._apply_matcher(self._build_matcher(self._blacklist))
+
+    def _apply_matcher(self, matcher: Dict[str, object]):
+        """Install a matcher from _build_matcher; synchronous, so on_message never sees a partial swap"""
+        for name, value in matcher.items():
+            setattr(self, name, value)
+        # Verdicts belong to the old word list; never let them outlive it
+        self._scan_cache = LRUCache(maxsize=2048)
+
+    def _build_matcher(self, blacklist: AbstractSet[str]) -> Dict[str, object]:
+        """Build matcher attributes for a word set without touching cog state (safe in a worker thread)"""
+        matcher: Dict[str, object] = {
+            "_hs_db": None,
+            "_hs_scratch": None,
+            "_ac": None,
+            "_small_words": (),
+            "_trie": {},
+            "_first_chars": frozenset(),
+            "_min_word_len": 0,
+        }
+        # Case-folded, deduplicated and interned once; builders and the small-list path share the tuple
+        # (casefold, like BlacklistCog, so 'ß' and 'ss' spellings meet in the middle)
+        words = tuple({sys.intern(word.casefold()) for word in blacklist if word})
+        matcher["_blacklist_words"] = words
+        if not words:
+            return matcher
+
+        # Prefilter: a message that contains no word's first character (either case) can't match
+        matcher["_first_chars"] = frozenset(
+            ch for word in words for ch in (word[0], word[0].upper())
+        )
+        matcher["_min_word_len"] = min(len(word) for word in words)
+
+        # Tiny lists: a few str.find calls beat building (and walking) any automaton
+        if len(words) <= self.SMALL_BLACKLIST_SIZE:
+            matcher["_small_words"] = words
+            return matcher
+
+        # Vectorized DFA scan; compiled once here, scratch space reused for every message
+        if hyperscan is not None:
+            try:
+                expressions = [_bounded_pattern(word).encode("utf-8") for word in words]
+                db = hyperscan.Database()
+                db.compile(
+                    expressions=expressions,
+                    ids=list(range(len(expressions))),
+                    elements=len(expressions),
+                    flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions),
+                )
+                matcher["_hs_db"] = db
+                matcher["_hs_scratch"] = hyperscan.Scratch(db)
+                return matcher
+            except hyperscan.error as e:
+                print(f"[AutoMod] Hyperscan compile error: {e}")
+
+        # Linear-time DFA: a single pass over the message regardless of blacklist size
+        if ahocorasick_rs is not None:
+            matcher["_ac"] = ahocorasick_rs.AhoCorasick(list(words), matchkind=ahocorasick_rs.MatchKind.Standard)
+            return matcher
+
+        # Pure-Python fallback: a nested-dict trie, so lookup cost depends on message length only
+        trie: dict = {}
+        for word in words:
+            node = trie
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[_TRIE_END] = True
+        matcher["_trie"] = trie
+        return matcher
+
+    def _blacklist_unchanged(self) -> bool:
+        return self._blacklist_version is not None and self._words_file_version() == self._blacklist_version
+
+    def _unsaved_blacklist(self) -> Optional[FrozenSet[str]]:
+        """BlacklistCog's snapshot while its debounced save is pending: words.py is behind it then"""
+        cog = self.bot.get_cog("BlacklistCog")
+        if cog is not None and cog.save_pending:
+            return cog.snapshot
+        return None
+
+    def reload_blacklist(self) -> AbstractSet[str]:
         """Reload blacklist manually"""
+        unsaved = self._unsaved_blacklist()
+        if unsaved is not None:
+            self._blacklist, self._blacklist_version = unsaved, None
+            self._compile_blacklist_patterns()
+            return self._blacklist
+        # Unchanged file: the compiled matcher is still current, skip the rebuild
+        if self._blacklist_unchanged():
+            return self._blacklist
         self._load_blacklist()
         self._compile_blacklist_patterns()
-        self._is_staff_cached.cache_clear()
         return self._blacklist
 
+    async def reload_blacklist_async(self) -> AbstractSet[str]:
+        """Reload blacklist with parsing and matcher compilation off the event loop"""
+        unsaved = self._unsaved_blacklist()
+        if unsaved is not None:
+            # Re-reading words.py now would undo the edit that is still waiting to be saved
+            await self.on_blacklist_update(unsaved)
+            return self._blacklist
+        if self._blacklist_unchanged():
+            return self._blacklist
+        generation = self._blacklist_generation
+
+        def build():
+            blacklist, version = self._read_blacklist()
+            return blacklist, version, self._build_matcher(blacklist)
+
+        blacklist, version, matcher = await asyncio.to_thread(build)
+        if generation != self._blacklist_generation:
+            return self._blacklist  # a blacklist_update arrived while reading; it is newer than this file read
+        # Back on the loop thread: swap everything in before any other handler can run
+        self._blacklist, self._blacklist_version = blacklist, version
+        self._apply_matcher(matcher)
+        return self._blacklist
+
+    @commands.Cog.listener()
+    async def on_blacklist_update(self, words: FrozenSet[str]):
+        """Adopt BlacklistCog's frozenset by reference instead of re-reading words.py"""
+        self._pending_blacklist = words
+        self._blacklist_generation += 1
+        matcher = await asyncio.to_thread(self._build_matcher, words)
+        if self._pending_blacklist is not words:
+            return  # superseded by a newer update while compiling
+        # No file version: the debounced save may not have landed yet, so a manual reload re-reads
+        self._blacklist, self._blacklist_version = words, None
+        self._apply_matcher(matcher)
+
     # ---------------- Database & warnings ----------------
     def _init_database(self):
         if not self.db_file:
             return
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                conn.execute(
-                    """CREATE TABLE IF NOT EXISTS warnings (
-                        user_id INTEGER PRIMARY KEY,
-                        warning_count INTEGER NOT NULL DEFAULT 0,
-                        last_warning TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )"""
-                )
-                conn.commit()
+            # One long-lived connection in autocommit mode instead of connect-per-query
+            conn = sqlite3.connect(self.db_file, check_same_thread=False, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS warnings (
+                    user_id INTEGER PRIMARY KEY,
+                    warning_count INTEGER NOT NULL DEFAULT 0,
+                    last_warning TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )"""
+            )
+            self._conn = conn
             print(f"[AutoMod] Database initialized: {self.db_file}")
         except sqlite3.Error as e:
             print(f"[AutoMod] Database init error: {e}")
             self.db_file = None
 
     def _db_execute(self, query: str, params: tuple = (), fetch: bool = False):
-        if not self.db_file:
+        if not self.db_file or self._conn is None:
             return None
         try:
-            with sqlite3.connect(self.db_file) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.execute(query, params)
+            with self._db_lock:
+                cursor = self._conn.execute(query, params)
                 if fetch:
                     result = cursor.fetchone()
                     return dict(result) if result else None
-                conn.commit()
                 return True
         except sqlite3.Error as e:
             print(f"[AutoMod] Database error: {e}")
             self.db_file = None
             return None
 
-    def get_warning_count(self, user_id: int) -> int:
-        if self.db_file:
-            res = self._db_execute(
-                "SELECT warning_count FROM warnings WHERE user_id = ?", (user_id,), fetch=True
-            )
-            if res:
-                return res.get("warning_count", 0) # type: ignore
-        return self.fallback_warnings.get(user_id, 0)
+    async def cog_load(self):
+        self._flusher = asyncio.create_task(self._flush_loop())
 
-    def increment_warning(self, user_id: int) -> int:
-        current = self.get_warning_count(user_id)
-        new_count = current + 1
-        if self.db_file:
-            self._db_execute(
-                "INSERT OR REPLACE INTO warnings (user_id, warning_count) VALUES (?, ?)",
-                (user_id, new_count)
-            )
-        else:
-            self.fallback_warnings[user_id] = new_count
+    async def cog_unload(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        # Persist anything still pending, plus a batch whose flush was cancelled, before closing
+        batch = {**self._writing, **self._pending_writes}
+        self._writing, self._pending_writes = {}, {}
+        if not self._write_batch(batch):
+            print(f"[AutoMod] Lost {len(batch)} warning count(s) on unload.")
+        with self._db_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _known_warning_count(self, user_id: int) -> Optional[int]:
+        # Queued and in-flight writes are newer than the database row
+        for counts in (self.warning_counts, self._pending_writes, self._writing):
+            count = counts.get(user_id)
+            if count is not None:
+                return count
+        return None
+
+    def _read_warning_count(self, user_id: int) -> int:
+        if not self.db_file:
+            return 0
+        res = self._db_execute(
+            "SELECT warning_count FROM warnings WHERE user_id = ?", (user_id,), fetch=True
+        )
+        return res.get("warning_count", 0) if res else 0 # type: ignore
+
+    async def get_warning_count(self, user_id: int) -> int:
+        # In-memory counts are authoritative; the database is only read on first sight of a user,
+        # in a worker thread so a flush holding _db_lock never blocks the event loop
+        count = self._known_warning_count(user_id)
+        if count is None:
+            count = await asyncio.to_thread(self._read_warning_count, user_id)
+            # Another message from this user may have been counted while we were reading
+            known = self._known_warning_count(user_id)
+            if known is not None:
+                count = known
+            self.warning_counts[user_id] = count
+        return count
+
+    async def increment_warning(self, user_id: int) -> int:
+        new_count = await self.get_warning_count(user_id) + 1
+        self.warning_counts[user_id] = new_count
+        self._queue_write(user_id, new_count)
         return new_count
 
     def reset_warnings(self, user_id: int):
+        self.warning_counts[user_id] = 0
+        self._queue_write(user_id, 0)
+
+    # ---------------- Background persistence ----------------
+    def _queue_write(self, user_id: int, count: int):
         if self.db_file:
-            self._db_execute(
-                "UPDATE warnings SET warning_count = 0 WHERE user_id = ?", (user_id,)
-            )
-        else:
-            self.fallback_warnings.pop(user_id, None)
+            # Later writes for the same user overwrite earlier ones until the next flush
+            self._pending_writes[user_id] = count
+            self._pending_event.set()
+
+    def _write_batch(self, batch: Dict[int, int]) -> bool:
+        """Persist a batch of counts in a single transaction (runs in a worker thread); False if it should be retried"""
+        if not batch:
+            return True
+        with self._db_lock:
+            if not self.db_file or self._conn is None:
+                print(f"[AutoMod] Database unavailable, {len(batch)} warning count(s) not saved.")
+                return True
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    """INSERT INTO warnings (user_id, warning_count) VALUES (?, ?)
+                       ON CONFLICT(user_id) DO UPDATE SET
+                           warning_count = excluded.warning_count,
+                           last_warning = CURRENT_TIMESTAMP""",
+                    batch.items()
+                )
+                self._conn.execute("COMMIT")
+            except sqlite3.Error as e:
+                print(f"[AutoMod] Database write error ({len(batch)} warning count(s) pending): {e}")
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                return False
+        return True
+
+    async def _flush_loop(self):
+        while True:
+            # Sleep until there is work, then give bursts a moment to coalesce
+            await self._pending_event.wait()
+            await asyncio.sleep(self.FLUSH_INTERVAL)
+            self._pending_event.clear()
+            batch, self._pending_writes = self._pending_writes, {}
+            self._writing = batch
+            written = await asyncio.to_thread(self._write_batch, batch)
+            self._writing = {}
+            if not written:
+                # Re-queue the rows unless a newer count for the user arrived meanwhile; evicted
+                # warning_counts entries are re-read from here, so nothing is lost during an outage
+                for user_id, count in batch.items():
+                    self._pending_writes.setdefault(user_id, count)
+                await asyncio.sleep(self.RETRY_DELAY)
+                self._pending_event.set()
 
     # ---------------- Staff check ----------------
-    @lru_cache(maxsize=1000)
     def _is_staff_cached(self, user_id: int, guild_id: int) -> bool:
+        key = (user_id, guild_id)
+        cached = self._staff_cache.get(key)
+        if cached is not None:
+            return cached
         guild = self.bot.get_guild(guild_id)
         if not guild:
             return False
         member = guild.get_member(user_id)
         if not member:
             return False
-        return member.guild_permissions.manage_messages or member.guild_permissions.administrator or member.id == guild.owner_id
+        is_staff = member.guild_permissions.manage_messages or member.guild_permissions.administrator or member.id == guild.owner_id
+        self._staff_cache[key] = is_staff
+        return is_staff
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member):
+        # Roles may have changed; drop only this member's entry
+        self._staff_cache.pop((before.id, before.guild.id), None)
 
     # ---------------- Blacklist check ----------------
     def _contains_blacklisted_word(self, text: str) -> bool:
         if not self._blacklist:
             return False
-        if self._pattern:
-            return bool(self._pattern.search(text))
-        text_lower = text.lower()
-        return any(word in text_lower for word in self._blacklist)
+        if self._hs_db is not None:
+            # HS_FLAG_CASELESS folds ASCII already; only non-ASCII text needs a folded copy
+            # (str.isascii is O(1), the flag is cached on the string object)
+            if text.isascii():
+                if len(text) < self._min_word_len or self._first_chars.isdisjoint(text):
+                    return False
+                data = text.encode("utf-8")
+            else:
+                data = text.casefold().encode("utf-8")
+            try:
+                self._hs_db.scan(
+                    data,
+                    match_event_handler=_stop_on_match,
+                    scratch=self._hs_scratch,
+                )
+            except hyperscan.ScanTerminated:
+                return True
+            return False
+        # Patterns are case-folded at compile time; lowercase ASCII is already folded, skip the copy
+        text_lower = text if text.isascii() and text.islower() else text.casefold()
+        if len(text_lower) < self._min_word_len or self._first_chars.isdisjoint(text_lower):
+            return False
+        if self._small_words:
+            return self._small_list_contains(text_lower)
+        if self._ac is not None:
+            # Overlapping matches so a word rejected by the boundary check can't hide another hit
+            for _, start, end in self._ac.find_matches_as_indexes(text_lower, overlapping=True):
+                if _has_word_boundaries(text_lower, start, end):
+                    return True
+            return False
+        return self._trie_contains(text_lower)
+
+    def _is_blacklisted_cached(self, content: str) -> bool:
+        """Memoized blacklist verdict, so repeated spam is only scanned once"""
+        verdict = self._scan_cache.get(content)
+        if verdict is None:
+            verdict = self._contains_blacklisted_word(content)
+            self._scan_cache[content] = verdict
+        return verdict
+
+    def _small_list_contains(self, text_lower: str) -> bool:
+        """Find each word directly, checking boundaries on every occurrence"""
+        for word in self._small_words:
+            start = text_lower.find(word)
+            while start >= 0:
+                if _has_word_boundaries(text_lower, start, start + len(word)):
+                    return True
+                start = text_lower.find(word, start + 1)
+        return False
+
+    def _trie_contains(self, text_lower: str) -> bool:
+        """Walk the trie from every start index, stopping at the first bounded word"""
+        root = self._trie
+        length = len(text_lower)
+        for i, ch in enumerate(text_lower):
+            node = root.get(ch)
+            j = i + 1
+            while node is not None:
+                if _TRIE_END in node and _has_word_boundaries(text_lower, i, j):
+                    return True
+                if j >= length:
+                    break
+                node = node.get(text_lower[j])
+                j += 1
+        return False
 
     # ---------------- On message listener ----------------
     @commands.Cog.listener()
@@ -167,26 +506,30 @@ class AutoMod(commands.Cog):
             return
 
         # Check blacklist
-        if self._contains_blacklisted_word(message.content):
+        if self._is_blacklisted_cached(message.content):
+            user_id = message.author.id
+            # Count and escalate only once the delete has succeeded: a message that is already gone
+            # (deleted by a mod, or a duplicate event) or that we can't remove must not add a warning
             try:
                 await message.delete()
-                user_id = message.author.id
-                warnings = self.increment_warning(user_id)
+            except discord.NotFound:
+                return
+            except discord.Forbidden:
+                await self._send_warning(message, await self.get_warning_count(user_id))
+                return
+            except Exception as e:
+                print(f"[AutoMod] Error: {e}")
+                return
 
+            try:
+                warnings = await self.increment_warning(user_id)
                 if warnings >= self.MAX_WARNINGS:
                     await self._handle_max_warnings(message, user_id)
                 else:
                     await self._send_warning(message, warnings)
-            except discord.NotFound:
-                pass
-            except discord.Forbidden:
-                await self._send_warning(message, self.get_warning_count(message.author.id))
             except Exception as e:
                 print(f"[AutoMod] Error: {e}")
 
-        # Allow commands to work even with on_message listener
-        await self.bot.process_commands(message)
-
     async def _handle_max_warnings(self, message: discord.Message, user_id: int):
         member = message.guild.get_member(user_id) # type: ignore
         if not member:
@@ -224,8 +567,8 @@ class AutoMod(commands.Cog):
         if warning_count >= self.MAX_WARNINGS - 1:
             embed.add_field(name="Final Warning", value="Next violation will result in a kick!", inline=False)
         try:
-            warning_msg = await message.channel.send(embed=embed)
-            await warning_msg.delete(delay=10)
+            # delete_after schedules the cleanup in the background instead of another awaited call
+            await message.channel.send(embed=embed, delete_after=10)
         except Exception as e:
             print(f"[AutoMod] Error sending warning: {e}")
 
@@ -234,7 +577,7 @@ class AutoMod(commands.Cog):
     @commands.has_permissions(administrator=True)
     async def reload_blacklist_command(self, ctx: commands.Context):
         try:
-            reloaded = self.reload_blacklist()
+            reloaded = await self.reload_blacklist_async()
             await ctx.send(f"✅ Blacklist reloaded: {len(reloaded)} words.", delete_after=10)
         except Exception as e:
             await ctx.send(f"❌ Error reloading blacklist: {e}", delete_after=10)
@@ -243,7 +586,7 @@ class AutoMod(commands.Cog):
     @commands.has_permissions(manage_messages=True)
     async def check_warnings(self, ctx: commands.Context, member: Optional[discord.Member] = None):
         target = member or ctx.author
-        count = self.get_warning_count(target.id)
+        count = await self.get_warning_count(target.id)
         embed = discord.Embed(
             title=f"⚠️ Warnings for {target.display_name}",
             description=f"Current warnings: **{count}/{self.MAX_WARNINGS}**",
@@ -3,78 +3,236 @@
 # Blacklist manager with UI + event broadcasting
 
 import os
-import ast
-import importlib.util
-from typing import List, Set
+import json
+import stat
+import bisect
+import asyncio
+import tempfile
+import threading
+from typing import AbstractSet, List, Optional, Set, Tuple, Union
 
 import discord
 from discord.ext import commands
 from discord import ui
 
 WORDS_FILE = "cogs/words.py"
+# Sidecar copy of the blacklist as a flat JSON list; one json.load instead of parsing words.py
+WORDS_JSON = "cogs/words.json"
 DEFAULT_TIMEOUT: float = 300.0
 MONO_MAX = 1990
+MAX_SELECT_OPTIONS = 25  # Discord limit per select menu
+
+
+def _normalize(word: str) -> str:
+    """Canonical stored form of a blacklist entry (casefold also maps e.g. 'ß' to 'ss')"""
+    return word.strip().casefold()
 
 
 # ---------- storage helpers ----------
-def load_blacklist_from_file(path: str = WORDS_FILE) -> List[str]:
-    if not os.path.exists(path):
-        return []
+def _source_stamp(st: os.stat_result) -> List[int]:
+    """Identity of the words.py the sidecar was built from: (mtime_ns, size)"""
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _load_blacklist_json(json_path: str, source_stamp: Optional[List[int]]) -> Optional[List[str]]:
+    """Read the JSON sidecar, unless it is missing or was built from another words.py (edited by hand/other cogs)"""
+    # No words.py means nothing to vouch for the sidecar: a deleted list must stay deleted
+    if source_stamp is None:
+        return None
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            content = f.read()
+        with open(json_path, "rb") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"[Blacklist] Ignoring unreadable {json_path}: {e}")
+        return None
+    # A bare list is the stamp-less older format: treat it as stale
+    if not isinstance(data, dict) or not isinstance(data.get("words"), list):
+        return None
+    if data.get("source") != source_stamp:
+        return None
+    return [w for w in data["words"] if isinstance(w, str)]
+
+
+def write_file_atomic(path: str, content: str) -> None:
+    """Write content to a unique temp file beside path, then swap it in with os.replace"""
+    # Readers see either the old file or the new one, never a partial write
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = 0o644
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        # mkstemp creates the file 0600; keep the target's permissions across the swap
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, mode)
+        else:  # Windows before 3.13
+            os.chmod(tmp_path, mode)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+            # Data must be on disk before the rename, or a crash can leave an empty file
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
         try:
-            tree = ast.parse(content)
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Assign) and any(
-                    isinstance(t, ast.Name) and t.id == "blat" for t in node.targets
-                ):
-                    if isinstance(node.value, ast.List):
-                        return [
-                            ast.literal_eval(el)
-                            for el in node.value.elts
-                            if isinstance(el, ast.Constant) and isinstance(el.value, str)
-                        ]
-        except (SyntaxError, ValueError):
+            os.remove(tmp_path)
+        except OSError:
             pass
-        spec = importlib.util.spec_from_file_location("words_module", path)
-        if spec and spec.loader:
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)  # type: ignore
-            return list(getattr(module, "blat", []))
+        raise
+
+
+def _save_blacklist_json(payload: List[str], json_path: str, source_stamp: List[int]) -> None:
+    try:
+        write_file_atomic(json_path, json.dumps({"source": source_stamp, "words": payload}, ensure_ascii=False))
+    except IOError as e:
+        print(f"[Blacklist] Error saving file: {e}")
+
+
+def load_blacklist_from_file(path: str = WORDS_FILE, json_path: str = WORDS_JSON) -> List[str]:
+    # One stat of words.py serves both the staleness check and the missing/empty short-circuit
+    try:
+        st: Optional[os.stat_result] = os.stat(path)
+    except OSError:
+        st = None
+    words = _load_blacklist_json(json_path, _source_stamp(st) if st else None)
+    if words is not None:
+        return words
+    if st is None or st.st_size == 0:
+        return []
+    words = _load_blacklist_source(path)
+    # Migrate: later loads take the JSON fast path until words.py changes again. Stamped with the
+    # stat taken before reading, so a concurrent rewrite only makes the sidecar look stale
+    if words:
+        _save_blacklist_json(sorted(words), json_path, _source_stamp(st))
+    return words
+
+
+def _load_blacklist_source(path: str) -> List[str]:
+    # Only reached when the JSON sidecar is missing or stale
+    try:
+        with open(path, "rb") as f:
+            content = f.read()
+        # The literal parse runs no code from words.py; only a blat it can't read is executed
+        words = _parse_blat_literal(content)
+    except (OSError, SyntaxError, ValueError) as e:
+        print(f"[Blacklist] Error loading file: {e}")
+        return []
+    if words is not None:
+        return words
+    print(f"[Blacklist] No blat literal in {path}, executing it instead.")
+    try:
+        # Compiled from the bytes just read, never the __pycache__ copy: its check is mtime-to-the-second
+        # plus size, so a same-second rewrite of words.py would run stale bytecode
+        namespace: dict = {}
+        exec(compile(content, path, "exec"), namespace)
+        return [w for w in namespace.get("blat", []) if isinstance(w, str)]
     except Exception as e:
         print(f"[Blacklist] Error loading file: {e}")
     return []
 
 
-def save_blacklist_to_file(words: Set[str], path: str = WORDS_FILE) -> None:
+def parse_blacklist_source(path: str) -> List[str]:
+    """Read the string literals of `blat = [...]` in words.py without executing it"""
     try:
-        payload = sorted(list(words))
-        content = f"blat = {payload!r}\n"
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
-    except IOError as e:
+        with open(path, "rb") as f:
+            return _parse_blat_literal(f.read()) or []
+    except (OSError, SyntaxError, ValueError) as e:
+        print(f"[Blacklist] Error loading file: {e}")
+    return []
+
+
+def _parse_blat_literal(content: bytes) -> Optional[List[str]]:
+    """Strings of the top-level `blat` literal, or None when there is no literal to read"""
+    import ast
+
+    # ast.parse takes bytes and handles the encoding itself; no separate decode pass
+    tree = ast.parse(content)
+    # blat is a top-level assignment; no need to visit every nested node
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "blat" for t in node.targets
+        ):
+            value = node.value
+            # Accept frozenset({...}) / set([...]) wrappers around the literal
+            if (
+                isinstance(value, ast.Call)
+                and isinstance(value.func, ast.Name)
+                and value.func.id in ("frozenset", "set")
+                and len(value.args) == 1
+            ):
+                value = value.args[0]
+            if isinstance(value, (ast.List, ast.Tuple, ast.Set)):
+                return [
+                    el.value
+                    for el in value.elts
+                    if isinstance(el, ast.Constant) and isinstance(el.value, str)
+                ]
+    return None
+
+
+def save_blacklist_to_file(words: AbstractSet[str], path: str = WORDS_FILE, json_path: str = WORDS_JSON) -> bool:
+    payload = sorted(words)
+    # words.py stays the shared source for AutoMod and Moderation; written first so the JSON can carry its stamp
+    try:
+        write_file_atomic(path, f"blat = {payload!r}\n")
+        st = os.stat(path)
+    except OSError as e:
         print(f"[Blacklist] Error saving file: {e}")
+        return False  # the existing sidecar still matches the words.py left on disk
+    _save_blacklist_json(payload, json_path, _source_stamp(st))
+    return True
 
 
-def chunk_words(words: List[str], per_page: int = 100) -> List[str]:
-    pages: List[str] = []
-    page: List[str] = []
+def page_bounds(words: List[str], per_page: int = 100) -> List[Tuple[int, int]]:
+    """(start, end) word indexes of each page; pages hold per_page words and stay under MONO_MAX chars"""
+    bounds: List[Tuple[int, int]] = []
+    start = 0
     length = 0
-    for w in words:
-        add_len = (2 if page else 0) + len(w)
-        if page and (length + add_len) > MONO_MAX:
-            pages.append(", ".join(page))
-            page, length = [w], len(w)
+    for i, w in enumerate(words):
+        add_len = (2 if i > start else 0) + len(w)
+        if i > start and (length + add_len) > MONO_MAX:
+            bounds.append((start, i))
+            start, length = i, len(w)
         else:
-            page.append(w)
             length += add_len
-        if len(page) >= per_page:
-            pages.append(", ".join(page))
-            page, length = [], 0
-    if page:
-        pages.append(", ".join(page))
-    return pages
+        if i + 1 - start >= per_page:
+            bounds.append((start, i + 1))
+            start, length = i + 1, 0
+    if start < len(words):
+        bounds.append((start, len(words)))
+    return bounds
+
+
+def chunk_words(words: List[str], per_page: int = 100) -> List[str]:
+    return [", ".join(words[start:end]) for start, end in page_bounds(words, per_page)]
+
+
+def build_preview(words: List[str]) -> str:
+    preview = ", ".join(words[:20]) if words else "No words."
+    if len(words) > 20:
+        preview += f"\n\n({len(words) - 20} more words not shown)"
+    return f"📝 **Blacklist Preview** ({len(words)} words)\n\n{preview}"
+
+
+class BlacklistPages:
+    """Sorted words plus everything the UI derives from them; built once per blacklist change
+    and shared read-only by every open view"""
+
+    def __init__(self, words: List[str], per_page: int = 100) -> None:
+        self.words = words
+        # Page boundaries only; page text is joined when that page is shown
+        self.bounds = page_bounds(words, per_page)
+        self.page_starts = [start for start, _ in self.bounds]
+        # folded word -> position in the sorted list, so search is one hash lookup whatever the case
+        self.index = {w.casefold(): i for i, w in enumerate(words)}
+        # First index of each starting character (words are sorted, so insertion order is sorted too)
+        self.letter_start: dict = {}
+        for i, w in enumerate(words):
+            if w and w[0] not in self.letter_start:
+                self.letter_start[w[0]] = i
+        self.preview = build_preview(words)
 
 
 # ---------- UI ----------
@@ -86,15 +244,18 @@ class SearchModal(ui.Modal, title="Search Blacklist"):
         self.parent_view = parent_view
 
     async def on_submit(self, interaction: discord.Interaction):
-        word = self.query.value.lower().strip()
+        word = _normalize(self.query.value)
         if not word:
             return await interaction.response.send_message("Please enter a word.", ephemeral=True)
 
-        if word not in self.parent_view.words:
+        idx = self.parent_view._index.get(word)
+        if idx is None:
+            # Not an exact entry: jump to the first word starting with what was typed
+            idx = self.parent_view.prefix_start(word)
+        if idx is None:
             return await interaction.response.send_message("Word not found in blacklist.", ephemeral=True)
 
-        idx = self.parent_view.words.index(word)
-        self.parent_view.page_index = idx // 100
+        self.parent_view.page_index = self.parent_view.page_of(idx)
         self.parent_view.show_page()
         await interaction.response.edit_message(view=self.parent_view)
 
@@ -133,15 +294,44 @@ class BlacklistNavButtons(ui.ActionRow):
 
 
 
+class LetterJump(ui.ActionRow):
+    def __init__(self, parent_view: 'BlacklistLayoutView') -> None:
+        super().__init__()
+        self.parent_view = parent_view
+        # One option per starting character, grouped into ranges when there are more than Discord allows
+        chars = list(parent_view._letter_start)
+        groups = min(len(chars), MAX_SELECT_OPTIONS)
+        options = []
+        for g in range(groups):
+            group = chars[g * len(chars) // groups:(g + 1) * len(chars) // groups]
+            label = group[0] if len(group) == 1 else f"{group[0]}–{group[-1]}"
+            options.append(discord.SelectOption(label=label, value=group[0]))
+        self.jump.options = options
+
+    @ui.select(placeholder="Jump to letter...")
+    async def jump(self, interaction: discord.Interaction, select: ui.Select):
+        start = self.parent_view._letter_start[select.values[0]]
+        self.parent_view.page_index = self.parent_view.page_of(start)
+        self.parent_view.show_page()
+        await interaction.response.edit_message(view=self.parent_view)
+
+
 class BlacklistLayoutView(ui.LayoutView):
-    def __init__(self, words: List[str]) -> None:
+    def __init__(self, data: Union[BlacklistPages, List[str]]) -> None:
         super().__init__()
-        self.words = words
-        self.pages = chunk_words(words, per_page=100)
+        # The cog passes its cached BlacklistPages, making construction O(1); a bare list is indexed here
+        if not isinstance(data, BlacklistPages):
+            data = BlacklistPages(data)
+        self.words = data.words
+        self._index = data.index
+        self._bounds = data.bounds
+        self._page_starts = data.page_starts
+        self._letter_start = data.letter_start
+        self._preview_text = data.preview
         self.preview_mode = True
         self.page_index = 0
 
-        self.display = ui.TextDisplay(self._get_preview_content())
+        self.display = ui.TextDisplay(self._preview_text)
 
         container = ui.Container(
             self.display,
@@ -149,29 +339,37 @@ class BlacklistLayoutView(ui.LayoutView):
             BlacklistNavButtons(self),
             accent_color=discord.Color.red()
         )
+        if self._letter_start:
+            container.add_item(LetterJump(self))
         self.add_item(container)
 
-    def _get_preview_content(self) -> str:
-        preview = ", ".join(self.words[:20]) if self.words else "No words."
-        if len(self.words) > 20:
-            preview += f"\n\n({len(self.words) - 20} more words not shown)"
-        return f"📝 **Blacklist Preview** ({len(self.words)} words)\n\n{preview}"
+    def page_of(self, word_index: int) -> int:
+        """Page containing the word at word_index in self.words"""
+        return max(0, bisect.bisect_right(self._page_starts, word_index) - 1)
+
+    def prefix_start(self, prefix: str) -> Optional[int]:
+        """Index of the first word starting with prefix, or None"""
+        i = bisect.bisect_left(self.words, prefix)
+        if i < len(self.words) and self.words[i].startswith(prefix):
+            return i
+        return None
 
     def _get_page_content(self) -> str:
-        if not self.pages:
+        if not self._bounds:
             return "No words."
-        total_pages = max(1, len(self.pages))
-        text = self.pages[self.page_index]
+        total_pages = len(self._bounds)
+        start, end = self._bounds[self.page_index]
+        text = ", ".join(self.words[start:end])
         return (
             f"📕 **Blacklist Page {self.page_index + 1}/{total_pages}**\n\n"
             f"{text}\n\n"
-            f"Showing words {self.page_index*100+1}-{min((self.page_index+1)*100,len(self.words))} "
+            f"Showing words {start + 1}-{end} "
             f"of {len(self.words)}"
         )
 
     def show_preview(self):
         self.preview_mode = True
-        self.display.content = self._get_preview_content()
+        self.display.content = self._preview_text
 
     def show_page(self):
         self.preview_mode = False
@@ -183,7 +381,7 @@ class BlacklistLayoutView(ui.LayoutView):
         self.show_page()
 
     def next_page(self):
-        if not self.preview_mode and self.page_index < len(self.pages) - 1:
+        if not self.preview_mode and self.page_index < len(self._bounds) - 1:
             self.page_index += 1
         self.show_page()
 
@@ -192,48 +390,107 @@ class BlacklistLayoutView(ui.LayoutView):
 class BlacklistCog(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self._blacklist_cache: Set[str] = set(load_blacklist_from_file())
+        self._blacklist_cache: Set[str] = {_normalize(w) for w in load_blacklist_from_file()}
+        # Immutable snapshot handed to blacklist_update listeners; shared, never copied per dispatch
+        self._blacklist_frozen: frozenset = frozenset(self._blacklist_cache)
+        # Kept sorted incrementally (bisect) so opening the UI never re-sorts the whole list
+        self._sorted: List[str] = sorted(self._blacklist_cache)
+        # UI data derived from the blacklist; rebuilt lazily after each add/remove
+        self._pages_cache: Optional[BlacklistPages] = None
+
+        # Saves are debounced: bursts of add/remove collapse into one write, done off the event loop
+        self.SAVE_DELAY = 1.0
+        self._dirty = asyncio.Event()
+        self._save_lock = threading.Lock()
+        self._saving = False
+        self._saver: Optional[asyncio.Task] = None
+
+    async def cog_load(self):
+        self._saver = asyncio.create_task(self._save_loop())
+
+    def cog_unload(self):
+        if self._saver is not None:
+            self._saver.cancel()
+            self._saver = None
+        # Don't lose an edit made inside the debounce window
+        if self._dirty.is_set():
+            self._dirty.clear()
+            self._save_snapshot(self._blacklist_frozen)
+
+    def _save_snapshot(self, words: frozenset):
+        with self._save_lock:
+            save_blacklist_to_file(words)
+
+    async def _save_loop(self):
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.SAVE_DELAY)
+            self._dirty.clear()
+            self._saving = True
+            try:
+                await asyncio.to_thread(self._save_snapshot, self._blacklist_frozen)
+            finally:
+                self._saving = False
 
     @property
     def blacklist(self) -> Set[str]:
         return self._blacklist_cache
 
+    @property
+    def snapshot(self) -> frozenset:
+        return self._blacklist_frozen
+
+    @property
+    def save_pending(self) -> bool:
+        """True while an add/remove has not reached words.py yet"""
+        return self._dirty.is_set() or self._saving
+
+    def _get_view_data(self) -> BlacklistPages:
+        if self._pages_cache is None:
+            # Views keep this snapshot, so hand them a copy rather than the live list
+            self._pages_cache = BlacklistPages(list(self._sorted))
+        return self._pages_cache
+
     def _persist_and_broadcast(self):
-        save_blacklist_to_file(self._blacklist_cache)
+        self._pages_cache = None
+        self._blacklist_frozen = frozenset(self._blacklist_cache)
+        self._dirty.set()
         # 🔥 Event-based broadcast
-        self.bot.dispatch("blacklist_update", self._blacklist_cache.copy())
+        self.bot.dispatch("blacklist_update", self._blacklist_frozen)
 
     @commands.hybrid_command(name="add_bad_word", description="Add a word to the blacklist")
     @commands.has_permissions(administrator=True)
     async def add_bad_word(self, ctx: commands.Context, *, word: str):
-        w = word.lower().strip()
+        w = _normalize(word)
         if not w:
             return await ctx.send("Please provide a valid word or phrase.")
         if w in self._blacklist_cache:
             return await ctx.send(f"`{word}` is already blacklisted.")
         self._blacklist_cache.add(w)
+        bisect.insort(self._sorted, w)
         self._persist_and_broadcast()
         await ctx.send(f"✅ Added `{word}` to blacklist.")
 
     @commands.hybrid_command(name="remove_bad_word", description="Remove a word from the blacklist")
     @commands.has_permissions(administrator=True)
     async def remove_bad_word(self, ctx: commands.Context, *, word: str):
-        w = word.lower().strip()
+        w = _normalize(word)
         if not w:
             return await ctx.send("Please provide a valid word or phrase.")
         if w not in self._blacklist_cache:
             return await ctx.send(f"`{word}` not found in blacklist.")
         self._blacklist_cache.discard(w)
+        del self._sorted[bisect.bisect_left(self._sorted, w)]
         self._persist_and_broadcast()
         await ctx.send(f"✅ Removed `{word}` from blacklist.")
 
     @commands.hybrid_command(name="list_blacklist", description="Preview and browse the blacklist with UI")
     @commands.has_permissions(administrator=True)
     async def list_blacklist(self, ctx: commands.Context):
-        words = sorted(list(self._blacklist_cache))
-        if not words:
+        data = self._get_view_data()
+        if not data.words:
             return await ctx.send("✅ Blacklist is empty.")
-        view = BlacklistLayoutView(words)
+        view = BlacklistLayoutView(data)
         await ctx.send(view=view)
 
 
@@ -1,152 +1,202 @@
 from __future__ import annotations
+import functools
 import discord
 from discord.ext import commands
-from typing import Optional, Set
-import os
-import ast
-from functools import lru_cache
+from types import MappingProxyType
+from typing import Callable, FrozenSet, Mapping, Optional
+from cachetools import LRUCache
 from discord import ui
+import sys
 import time
+import traceback
 from datetime import timedelta
 
+# help argument alias -> _help_cache key
+_CATEGORY_ALIASES: dict[str, str] = {
+    'fun': 'fun', 'game': 'fun', 'games': 'fun',
+    'utility': 'utility', 'util': 'utility', 'tools': 'utility',
+    'mod': 'moderation', 'moderation': 'moderation', 'admin': 'moderation',
+    'info': 'info', 'information': 'info',
+}
+
+# Success replies for _moderation_action, as f-string builders taking (member, reason)
+def _kick_ok(member: discord.Member, reason: str) -> str:
+    return f"✅ {member.mention} has been kicked. Reason: {reason}"
+
+
+def _ban_ok(member: discord.Member, reason: str) -> str:
+    return f"✅ {member.mention} has been banned. Reason: {reason}"
+
+
+def _unmute_ok(member: discord.Member, reason: str) -> str:
+    return f"✅ {member.mention} has been unmuted."
+
+
+def _is_timed_out(member: discord.Member) -> tuple[bool, str]:
+    """Precondition for unmute"""
+    if member.timed_out_until is None:
+        return False, "This member is not currently timed out."
+    return True, ""
+
+
+# Help texts, built once at import and shared by every cog instance and view;
+# read-only so no instance can change another's menu
+_HELP_CACHE: Mapping[str, str] = MappingProxyType({
+    'main': (
+        "🤖 **Bot Help Menu**\n\n"
+        "Select a category below to see available commands!\n\n"
+        "📚 **Categories:**\n"
+        "• **Fun** - Entertainment commands\n"
+        "• **Utility** - Useful tools\n"
+        "• **Moderation** - Server management\n"
+        "• **Info** - Information commands\n\n"
+        "Use the buttons below to navigate!"
+    ),
+    'fun': (
+        "🎮 **Fun Commands**\n\n"
+        "**`-joke`** - Tells a random joke\n"
+        "**`-meme`** - Sends a random meme\n"
+        "**`-8ball <question>`** - Ask the magic 8ball\n"
+        "**`-trivia`** - Start a trivia game"
+    ),
+    'utility': (
+        "🔧 **Utility Commands**\n\n"
+        "**`-ping`** - Check latency\n"
+        "**`-ask <question>`** - Ask the bot a question\n"
+        "**`-serverinfo`** - Server info\n"
+        "**`-userinfo [@user]`** - User info"
+    ),
+    'moderation': (
+        "🛡️ **Moderation Commands**\n\n"
+        "**`-kick @user [reason]`** - Kick a user\n"
+        "**`-ban @user [reason]`** - Ban a user\n"
+        "**`-clear <amount>`** - Bulk delete messages\n"
+        "**`-mute @user`** - Mute a user\n"
+        "**`-unmute @user`** - Unmute a user"
+    ),
+    'info': (
+        "ℹ️ **Information Commands**\n\n"
+        "**`-userinfo [@user]`** - User info\n"
+        "**`-avatar [@user]`** - Avatar\n"
+        "**`-botinfo`** - Bot info\n"
+        "**`-serverinfo`** - Server info"
+    )
+})
 
 
 class ModerationCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.words_file = 'cogs/words.py'
-        self._blacklist_cache: Set[str] = set()
-        self._mute_role_cache: dict[int, discord.Role] = {}
-        self._last_ping: dict[int, float] = {}  # cooldown for mention replies
+        # Cooldown for mention replies; LRU-bounded so a flood of unique authors evicts itself
+        self._last_ping: LRUCache = LRUCache(maxsize=4096)
 
-        self._help_cache: dict[str, str] = {}  # cache help text strings
+        self._help_cache: Mapping[str, str] = _HELP_CACHE
+        self._bot_id: Optional[int] = None  # set once the bot user is known
 
-        self._load_blacklist_on_startup()
-        self._cache_help_strings()
         self.bot.remove_command('help')
 
-    # ---------------------- Blacklist ----------------------
-
-    def _load_blacklist_on_startup(self):
-        """Load blacklist once into memory"""
-        if os.path.exists(self.words_file):
-            try:
-                with open(self.words_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                if "=" in content:
-                    self._blacklist_cache = set(ast.literal_eval(content.split("=", 1)[1].strip()))
-            except Exception as e:
-                print(f"Error loading blacklist: {e}")
-                self._blacklist_cache = set()
+    async def cog_load(self):
+        # Extensions load from setup_hook, after login, so the bot user is normally known here
+        if self.bot.user is not None:
+            self._bot_id = self.bot.user.id
 
-    @property
-    def blacklist(self) -> Set[str]:
-        return self._blacklist_cache
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self._bot_id = self.bot.user.id
 
-    def _save_blacklist(self):
-        """Save blacklist quickly with overwrite"""
-        try:
-            with open(self.words_file, 'w', encoding='utf-8') as f:
-                f.write(f"blat = {list(self._blacklist_cache)!r}")
-        except IOError as e:
-            print(f"Error saving blacklist: {e}")
-
-    # ---------------------- Permissions ----------------------
-
-    @lru_cache(maxsize=128)
-    def _check_permissions(self, author_id: int, guild_id: int, permission: str) -> bool:
-        guild = self.bot.get_guild(guild_id)
-        if not guild:
-            return False
-        member = guild.get_member(author_id)
-        if not member:
-            return False
-        return getattr(member.guild_permissions, permission, False)
+    # ---------------------- Blacklist ----------------------
 
-    @commands.Cog.listener()
-    async def on_member_update(self, before: discord.Member, after: discord.Member):
-        # Clear permission cache when roles/permissions change
-        self._check_permissions.cache_clear()
+    @property
+    def blacklist(self) -> FrozenSet[str]:
+        # BlacklistCog owns the list; read its shared snapshot instead of keeping a second copy
+        cog = self.bot.get_cog("BlacklistCog")
+        return cog.snapshot if cog is not None else frozenset()
 
     # ---------------------- Helpers ----------------------
 
-    async def _safe_response(self, ctx_or_interaction, content: str, ephemeral: bool = False):
-        """Unified response handler for both context and interactions"""
+    async def _reply_ctx(self, ctx: commands.Context, content: str):
+        """Reply through a command context, ignoring send failures"""
+        # Hybrid contexts route slash invocations to the interaction response themselves
         try:
-            if isinstance(ctx_or_interaction, discord.Interaction):
-                if ctx_or_interaction.response.is_done():
-                    await ctx_or_interaction.followup.send(content, ephemeral=ephemeral)
-                else:
-                    await ctx_or_interaction.response.send_message(content, ephemeral=ephemeral)
+            await ctx.send(content)
+        except discord.HTTPException:
+            pass
+
+    async def _reply_interaction(self, interaction: discord.Interaction, content: str, ephemeral: bool = False):
+        """Reply to a raw interaction, using a followup once it has been answered"""
+        try:
+            if interaction.response.is_done():
+                await interaction.followup.send(content, ephemeral=ephemeral)
             else:
-                await ctx_or_interaction.send(content)
+                await interaction.response.send_message(content, ephemeral=ephemeral)
         except discord.HTTPException:
             pass
 
     def _can_moderate(self, guild: discord.Guild, author: discord.Member, target: discord.Member) -> tuple[bool, str]:
-        bot_user_id = self.bot.user.id
-        if target.id == bot_user_id:
+        # Plain int compares first; top_role is only resolved if they all pass
+        target_id = target.id
+        author_id = author.id
+        owner_id = guild.owner_id
+        if target_id == self._bot_id:
             return False, "I cannot moderate myself."
-        if target.id == author.id:
+        if target_id == author_id:
             return False, "You cannot moderate yourself."
-        if target.id == guild.owner_id:
+        # The owner outranks everyone (and is never the target here), so skip the role compare
+        if author_id == owner_id:
+            return True, ""
+        if target_id == owner_id:
             return False, "Cannot moderate the server owner."
-        if target.top_role >= author.top_role and author.id != guild.owner_id:
+        if target.top_role >= author.top_role:
             return False, "You cannot moderate someone with equal or higher role hierarchy."
         return True, ""
 
-    async def _moderation_action(self, ctx, member, action, reason, success_msg, fail_perm, fail_http):
-        """Wrapper to reduce duplicate code for ban/kick/etc."""
+    async def _moderation_action(self, ctx, member, action, reason, success_msg, fail_perm, fail_http,
+                                 extra_check: Optional[Callable[[discord.Member], tuple[bool, str]]] = None):
+        """Wrapper to reduce duplicate code for ban/kick/mute/unmute"""
         can_moderate, error_msg = self._can_moderate(ctx.guild, ctx.author, member)
+        if can_moderate and extra_check is not None:
+            can_moderate, error_msg = extra_check(member)
         if not can_moderate:
-            return await self._safe_response(ctx, f"❌ {error_msg}")
+            return await self._reply_ctx(ctx, f"❌ {error_msg}")
 
         try:
             await action(reason=reason)
-            await self._safe_response(ctx, success_msg.format(member=member, reason=reason))
+            await self._reply_ctx(ctx, success_msg(member, reason))
         except discord.Forbidden:
-            await self._safe_response(ctx, fail_perm)
+            await self._reply_ctx(ctx, fail_perm)
         except discord.HTTPException:
-            await self._safe_response(ctx, fail_http)
-
-    def _get_mute_role(self, guild: discord.Guild) -> Optional[discord.Role]:
-        """Cache and return mute role"""
-        if guild.id not in self._mute_role_cache:
-            role = discord.utils.find(lambda r: r.name.lower() == "muted", guild.roles)
-        return self._mute_role_cache[guild.id]
-    
-    @commands.Cog.listener()
-    async def on_blacklist_update(self, words: set[str]):
-        """Update internal cache if blacklist changes in BlacklistCog."""
-        self._blacklist_cache = set(words)
-        self._save_blacklist()
-        print(f"[ModerationCog] Blacklist updated via event: {len(words)} words")
+            await self._reply_ctx(ctx, fail_http)
 
+    async def cog_command_error(self, ctx: commands.Context, error: commands.CommandError):
+        # guild_only() rejects DM invocations before the command body runs
+        if isinstance(error, commands.NoPrivateMessage):
+            return await self._reply_ctx(ctx, "⚠️ This command can only be used in a server.")
+        # Anything else is reported the way discord.py's default handler would
+        print(f'Ignoring exception in command {ctx.command}:', file=sys.stderr)
+        traceback.print_exception(type(error), error, error.__traceback__, file=sys.stderr)
 
     # ---------------------- Commands ----------------------
 
     @commands.hybrid_command(name="kick", description="Kick a member from the server.")
+    @commands.guild_only()
     @commands.has_permissions(kick_members=True)
     async def kick(self, ctx: commands.Context, member: discord.Member, *, reason: Optional[str] = None):
-        if not ctx.guild:
-            return await self._safe_response(ctx, "⚠️ Server only.")
         reason = reason or "No reason provided"
         await self._moderation_action(
             ctx, member, member.kick, reason,
-            "✅ {member.mention} has been kicked. Reason: {reason}",
+            _kick_ok,
             "❌ I do not have permission to kick this member.",
             "⚠️ Failed to kick the member due to a Discord error."
         )
 
     @commands.hybrid_command(name="ban", description="Ban a member from the server.")
+    @commands.guild_only()
     @commands.has_permissions(ban_members=True)
     async def ban(self, ctx: commands.Context, member: discord.Member, *, reason: Optional[str] = None):
-        if not ctx.guild:
-            return await self._safe_response(ctx, "⚠️ Server only.")
         reason = reason or "No reason provided"
         await self._moderation_action(
             ctx, member, member.ban, reason,
-            "✅ {member.mention} has been banned. Reason: {reason}",
+            _ban_ok,
             "❌ I do not have permission to ban this member.",
             "⚠️ Failed to ban the member due to a Discord error."
         )
@@ -157,6 +207,7 @@ class ModerationCog(commands.Cog):
         name="mute",
         description="Timeouts a member for a certain duration (in minutes)"
     )
+    @commands.guild_only()
     @commands.has_permissions(moderate_members=True)
     async def mute(
         self,
@@ -169,31 +220,23 @@ class ModerationCog(commands.Cog):
         """
         Timeout a member for a given duration (minutes)
         """
-        if not ctx.guild:
-            return await self._safe_response(ctx, "⚠️ This command can only be used in a server.")
-
-        # Moderation check
-        can_moderate, error_msg = self._can_moderate(ctx.guild, ctx.author, member) # type: ignore
-        if not can_moderate:
-            return await self._safe_response(ctx, f"❌ {error_msg}")
-
         reason = reason or f"Timed out by {ctx.author}"
         duration = duration or 10
         timeout_duration = timedelta(minutes=float(duration))
 
-        try:
-            await member.timeout(timeout_duration, reason=reason)
-            await self._safe_response(ctx, f"✅ {member.mention} has been timed out for {duration} minute(s).")
-        except discord.Forbidden:
-            await self._safe_response(ctx, "❌ I do not have permission to timeout this member.")
-        except discord.HTTPException:
-            await self._safe_response(ctx, "⚠️ Failed to timeout the member.")
+        await self._moderation_action(
+            ctx, member, functools.partial(member.timeout, timeout_duration), reason,
+            lambda m, r: f"✅ {m.mention} has been timed out for {duration} minute(s).",
+            "❌ I do not have permission to timeout this member.",
+            "⚠️ Failed to timeout the member."
+        )
 
 
     @commands.hybrid_command(
         name="unmute",
         description="Removes timeout from a member"
     )
+    @commands.guild_only()
     @commands.has_permissions(moderate_members=True)
     async def unmute_command(
         self,
@@ -203,157 +246,95 @@ class ModerationCog(commands.Cog):
         """
         Remove timeout from a member
         """
-        if not ctx.guild:
-            return await self._safe_response(ctx, "⚠️ This command can only be used in a server.")
-    
-        # Moderation check
-        can_moderate, error_msg = self._can_moderate(ctx.guild, ctx.author, member) # type: ignore
-        if not can_moderate:
-            return await self._safe_response(ctx, f"❌ {error_msg}")
-    
-        if member.timed_out_until is None:
-            return await self._safe_response(ctx, "❌ This member is not currently timed out.")
-    
-        try:
-            # Remove the timeout (pass None positionally)
-            await member.timeout(None, reason=f"Unmuted by {ctx.author}")
-            await self._safe_response(ctx, f"✅ {member.mention} has been unmuted.")
-        except discord.Forbidden:
-            await self._safe_response(ctx, "❌ I do not have permission to remove the timeout.")
-        except discord.HTTPException:
-            await self._safe_response(ctx, "⚠️ Failed to unmute the member.")
+        # Remove the timeout (pass None positionally)
+        await self._moderation_action(
+            ctx, member, functools.partial(member.timeout, None), f"Unmuted by {ctx.author}",
+            _unmute_ok,
+            "❌ I do not have permission to remove the timeout.",
+            "⚠️ Failed to unmute the member.",
+            extra_check=_is_timed_out
+        )
 
     
 
     @commands.hybrid_command(name='clear', description='Delete a number of messages from the channel.')
+    @commands.guild_only()
     @commands.has_permissions(manage_messages=True)
     async def clear(self, ctx: commands.Context, amount: int = 10):
-        if not ctx.guild:
-            return await self._safe_response(ctx, "⚠️ Server only.")
         if amount <= 0:
-            return await self._safe_response(ctx, "❌ Please provide a valid number of messages to delete.")
+            return await self._reply_ctx(ctx, "❌ Please provide a valid number of messages to delete.")
         try:
             deleted = await ctx.channel.purge(limit=amount) # type: ignore
-            await self._safe_response(ctx, f"✅ Successfully deleted {len(deleted)} message(s).")
+            await self._reply_ctx(ctx, f"✅ Successfully deleted {len(deleted)} message(s).")
         except discord.Forbidden:
-            await self._safe_response(ctx, "❌ I do not have permission to manage messages.")
+            await self._reply_ctx(ctx, "❌ I do not have permission to manage messages.")
         except discord.HTTPException as e:
-            await self._safe_response(ctx, f"⚠️ Failed to delete messages: {e}")
+            await self._reply_ctx(ctx, f"⚠️ Failed to delete messages: {e}")
 
     # ---------------------- Events ----------------------
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
-        if message.author == self.bot.user:
+        # Cheapest reject first: covers our own messages and other bots
+        if message.author.bot:
             return
         # Reply when bot is pinged, but with cooldown
-        if self.bot.user in message.mentions:
-            now = time.time()
-            last = self._last_ping.get(message.author.id, 0)
-            if now - last > 5:  # 5s cooldown
+        mentions = message.mentions
+        if mentions and any(u.id == self._bot_id for u in mentions):
+            # Monotonic clock: immune to wall-clock jumps. Its epoch is arbitrary,
+            # so a missing entry must not be treated as timestamp 0
+            now = time.monotonic()
+            last = self._last_ping.get(message.author.id)
+            if last is None or now - last > 5:  # 5s cooldown
                 await message.channel.send(f"Hello {message.author.mention}! How can I help you?")
                 self._last_ping[message.author.id] = now
-        await self.bot.process_commands(message)
+        # No process_commands here: Bot.on_message already dispatches commands, and
+        # listeners run in addition to it, so calling it again would run commands twice
 
     # ---------------------- Help System ----------------------
 
-    def _cache_help_strings(self):
-        """Precompute help texts so they aren’t rebuilt every time"""
-        self._help_cache = {
-            'main': (
-                "🤖 **Bot Help Menu**\n\n"
-                "Select a category below to see available commands!\n\n"
-                "📚 **Categories:**\n"
-                "• **Fun** - Entertainment commands\n"
-                "• **Utility** - Useful tools\n"
-                "• **Moderation** - Server management\n"
-                "• **Info** - Information commands\n\n"
-                "Use the buttons below to navigate!"
-            ),
-            'fun': (
-                "🎮 **Fun Commands**\n\n"
-                "**`-joke`** - Tells a random joke\n"
-                "**`-meme`** - Sends a random meme\n"
-                "**`-8ball <question>`** - Ask the magic 8ball\n"
-                "**`-trivia`** - Start a trivia game"
-            ),
-            'utility': (
-                "🔧 **Utility Commands**\n\n"
-                "**`-ping`** - Check latency\n"
-                "**`-ask <question>`** - Ask the bot a question\n"
-                "**`-serverinfo`** - Server info\n"
-                "**`-userinfo [@user]`** - User info"
-            ),
-            'moderation': (
-                "🛡️ **Moderation Commands**\n\n"
-                "**`-kick @user [reason]`** - Kick a user\n"
-                "**`-ban @user [reason]`** - Ban a user\n"
-                "**`-clear <amount>`** - Bulk delete messages\n"
-                "**`-mute @user`** - Mute a user\n"
-                "**`-unmute @user`** - Unmute a user"
-            ),
-            'info': (
-                "ℹ️ **Information Commands**\n\n"
-                "**`-userinfo [@user]`** - User info\n"
-                "**`-avatar [@user]`** - Avatar\n"
-                "**`-botinfo`** - Bot info\n"
-                "**`-serverinfo`** - Server info"
-            )
-        }
-
     @commands.command(name='help', aliases=['h'])
     async def help_command(self, ctx, *, category: str = None): # type: ignore
-        view = HelpLayoutView(self.bot, self._help_cache)
+        view = HelpLayoutView()
         if category:
-            category = category.lower()
-            if category in ['fun', 'game', 'games']:
-                view.help_text.content = self._help_cache['fun']
-            elif category in ['utility', 'util', 'tools']:
-                view.help_text.content = self._help_cache['utility']
-            elif category in ['mod', 'moderation', 'admin']:
-                view.help_text.content = self._help_cache['moderation']
-            elif category in ['info', 'information']:
-                view.help_text.content = self._help_cache['info']
+            # Unknown categories fall back to the main menu
+            key = _CATEGORY_ALIASES.get(category.lower(), 'main')
+            view.help_text.content = self._help_cache[key]
         await ctx.send(view=view)
 
 
 # ---------------------- Help Layout Views ----------------------
 
-class HelpButtons(ui.ActionRow):
-    def __init__(self, parent_view: 'HelpLayoutView') -> None:
-        super().__init__()
-        self.parent_view = parent_view
+_PINK = discord.Color.pink()  # help container accent, resolved once
 
+# The rows hold no state of their own; callbacks reach the owning view through self.view
+class HelpButtons(ui.ActionRow['HelpLayoutView']):
     @ui.button(label='🎮 Fun', style=discord.ButtonStyle.secondary)
     async def fun_button(self, interaction: discord.Interaction, button: ui.Button) -> None:
-        self.parent_view.help_text.content = self.parent_view.help_cache['fun']
-        await interaction.response.edit_message(view=self.parent_view)
+        self.view.help_text.content = _HELP_CACHE['fun']
+        await interaction.response.edit_message(view=self.view)
 
     @ui.button(label='🔧 Utility', style=discord.ButtonStyle.secondary)
     async def utility_button(self, interaction: discord.Interaction, button: ui.Button) -> None:
-        self.parent_view.help_text.content = self.parent_view.help_cache['utility']
-        await interaction.response.edit_message(view=self.parent_view)
+        self.view.help_text.content = _HELP_CACHE['utility']
+        await interaction.response.edit_message(view=self.view)
 
     @ui.button(label='🛡️ Moderation', style=discord.ButtonStyle.secondary)
     async def mod_button(self, interaction: discord.Interaction, button: ui.Button) -> None:
-        self.parent_view.help_text.content = self.parent_view.help_cache['moderation']
-        await interaction.response.edit_message(view=self.parent_view)
+        self.view.help_text.content = _HELP_CACHE['moderation']
+        await interaction.response.edit_message(view=self.view)
 
     @ui.button(label='ℹ️ Info', style=discord.ButtonStyle.secondary)
     async def info_button(self, interaction: discord.Interaction, button: ui.Button) -> None:
-        self.parent_view.help_text.content = self.parent_view.help_cache['info']
-        await interaction.response.edit_message(view=self.parent_view)
-
+        self.view.help_text.content = _HELP_CACHE['info']
+        await interaction.response.edit_message(view=self.view)
 
-class HelpNavigationButtons(ui.ActionRow):
-    def __init__(self, parent_view: 'HelpLayoutView') -> None:
-        super().__init__()
-        self.parent_view = parent_view
 
+class HelpNavigationButtons(ui.ActionRow['HelpLayoutView']):
     @ui.button(label='🏠 Home', style=discord.ButtonStyle.secondary)
     async def home_button(self, interaction: discord.Interaction, button: ui.Button) -> None:
-        self.parent_view.help_text.content = self.parent_view.help_cache['main']
-        await interaction.response.edit_message(view=self.parent_view)
+        self.view.help_text.content = _HELP_CACHE['main']
+        await interaction.response.edit_message(view=self.view)
 
     @ui.button(label='❌ Close', style=discord.ButtonStyle.danger)
     async def close_button(self, interaction: discord.Interaction, button: ui.Button) -> None:
@@ -362,18 +343,16 @@ class HelpNavigationButtons(ui.ActionRow):
 
 
 class HelpLayoutView(ui.LayoutView):
-    def __init__(self, bot: commands.Bot, help_cache: dict[str, str]) -> None:
+    def __init__(self) -> None:
         super().__init__()
-        self.bot = bot
-        self.help_cache = help_cache
-        self.help_text = ui.TextDisplay(help_cache['main'])
+        self.help_text = ui.TextDisplay(_HELP_CACHE['main'])
 
         container = ui.Container(
             self.help_text,
             ui.Separator(),
-            HelpButtons(self),
-            HelpNavigationButtons(self),
-            accent_color=discord.Color.pink()
+            HelpButtons(),
+            HelpNavigationButtons(),
+            accent_color=_PINK
         )
         self.add_item(container)
 
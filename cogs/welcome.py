@@ -1,36 +1,73 @@
+import datetime
+
 import discord
 from discord.ext import commands
 
+# English month names, same as strftime("%B") in the default C locale
+_MONTHS = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+
+
+def _format_date(dt: datetime.datetime) -> str:
+    """Equivalent of dt.strftime("%B %d, %Y") without going through strftime"""
+    return f"{_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year}"
+
+
 class WelcomeCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        # Cache welcome, rules and chat channels per guild to avoid repeated lookups
+        # Cache welcome, rules and chat channel ids per guild to avoid repeated lookups.
+        # Ids rather than channel objects, resolved through guild.get_channel on use;
+        # the channel listeners below drop a guild's entry when its channels change
         self.guild_channels = {}
 
+    async def cog_load(self):
+        # One persistent instance answers the help/about/perks buttons on every welcome
+        # message, including those sent before a restart
+        self.bot.add_view(WelcomeButtonsView())
+
     async def cache_guild_channels(self, guild):
         # Cache channels if not already cached for this guild
         if guild.id not in self.guild_channels:
-            welcome_channel = discord.utils.get(guild.text_channels, name="welcome")
-            rules_channel = discord.utils.get(guild.text_channels, name="rules")
-            chat_channel = discord.utils.get(guild.text_channels, name="chat")
+            # One pass over text_channels (a freshly sorted list per access); first match per name wins
+            channel_ids = dict.fromkeys(("welcome", "rules", "chat"))
+            for channel in guild.text_channels:
+                if channel.name in channel_ids and channel_ids[channel.name] is None:
+                    channel_ids[channel.name] = channel.id
+            self.guild_channels[guild.id] = channel_ids
 
-            self.guild_channels[guild.id] = {
-                "welcome": welcome_channel,
-                "rules": rules_channel,
-                "chat": chat_channel,
-            }
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        # A new #welcome/#rules/#chat may now exist
+        self.guild_channels.pop(channel.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before, after):
+        if before.name != after.name:
+            self.guild_channels.pop(after.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel):
+        self.guild_channels.pop(channel.guild.id, None)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.guild_channels.pop(guild.id, None)
 
     @commands.Cog.listener()
     async def on_member_join(self, member: discord.Member):
         await self.cache_guild_channels(member.guild)
         channels = self.guild_channels[member.guild.id]
-        welcome_channel = channels["welcome"]
+        welcome_id = channels["welcome"]
+        welcome_channel = member.guild.get_channel(welcome_id) if welcome_id else None
         if not welcome_channel:
             return
 
         # Format join dates just once
-        created_at = member.created_at.strftime("%B %d, %Y")
-        joined_at = member.joined_at.strftime("%B %d, %Y") if member.joined_at else "Just now"
+        created_at = _format_date(member.created_at)
+        joined_at = _format_date(member.joined_at) if member.joined_at else "Just now"
 
         welcome_message = (
             f" Welcome to **{member.guild.name}**, {member.mention}! \n\n"
@@ -52,21 +89,27 @@ class WelcomeCog(commands.Cog):
         except Exception as e:
             # Use logging in production - print here for simplicity
             print(f"Failed to send welcome message: {e}")
+        finally:
+            # The view was only needed to render the buttons; stopping it drops its per-message
+            # entry from the view store, and clicks fall through to the persistent instance
+            view.stop()
 
 
 class WelcomeButtonsView(discord.ui.View):
-    def __init__(self, guild, channels):
+    def __init__(self, guild=None, channels=None):
         super().__init__(timeout=None)
         self.guild = guild
+        if channels is None:
+            return  # persistent instance: callback buttons only
 
-        rules_channel = channels.get("rules")
-        if rules_channel:
-            rules_url = f"https://discord.com/channels/{guild.id}/{rules_channel.id}"
+        rules_id = channels.get("rules")
+        if rules_id:
+            rules_url = f"https://discord.com/channels/{guild.id}/{rules_id}"
             self.add_item(discord.ui.Button(label="📖 Rules", style=discord.ButtonStyle.link, url=rules_url))
 
-        chat_channel = channels.get("chat")
-        if chat_channel:
-            chat_url = f"https://discord.com/channels/{guild.id}/{chat_channel.id}"
+        chat_id = channels.get("chat")
+        if chat_id:
+            chat_url = f"https://discord.com/channels/{guild.id}/{chat_id}"
             self.add_item(discord.ui.Button(label="Chat Here", style=discord.ButtonStyle.link, url=chat_url))
 
     @discord.ui.button(label="Show Help Commands", style=discord.ButtonStyle.primary, custom_id="welcome_help_btn")